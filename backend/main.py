@@ -1,20 +1,27 @@
+import os
 import base64
 from fastapi import FastAPI, UploadFile, File
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import Response
+from urllib.parse import quote
 from pydantic import BaseModel
 from typing import Optional, Dict
+from dotenv import load_dotenv
 
-# Import Gemini for image support
-from services.gemini_service import get_gemini_response 
+# Load environment once for all services
+load_dotenv()
 
-# Import Groq for fast responses
+# Import Groq for fast responses (used by almost every request)
 from services.groq_service import get_groq_response, get_groq_voice_response
 
-# Import Voice service
-from services.voice_service import transcribe_audio, speak_text
+# Gemini, Voice and Document services are imported inside the handlers
+# that use them, so cold starts only pay for what the request needs.
 
-# Import Document service (NEW)
-from services.document_service import process_document, summarize_document
+# Import Intent service (local fast-path before the LLM)
+from services.intent_service import classify_intent, get_template_response, route_model, get_intent_metrics, is_summary_request
+
+# Import Audio store (short-lived voice replies)
+from services.audio_store import put_audio, get_audio
 
 app = FastAPI()
 
@@ -28,11 +35,18 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Binary voice replies carry the text in headers
+    expose_headers=["X-Transcript", "X-Text-Response"],
 )
 
+# Opt-in request recorder for offline replay (see scripts/replay_requests.py)
+if os.getenv("RECORD_REQUESTS") == "1":
+    from services.recorder_service import RequestRecorder
+    app.add_middleware(RequestRecorder)
+
 # Store current document context (in production, use Redis or database)
-# Key: session_id, Value: document_text
-active_documents: Dict[str, str] = {}
+# Key: session_id, Value: document index {text, tokens, chunks} (see token_service)
+active_documents: Dict[str, Dict] = {}
 
 # --- ENHANCED CHAT ENDPOINT (Text + Images + Documents) ---
 class ChatRequest(BaseModel):
@@ -49,6 +63,7 @@ async def handle_chat(request: ChatRequest):
     - Regular text chat (Groq - fast)
     - Image analysis (Gemini - supports vision)
     - Document Q&A (Groq with document context)
+    - Trivial messages (greetings, thanks) answered locally without the LLM
     """
     user_message = request.message
     image_base64 = request.image
@@ -62,12 +77,15 @@ async def handle_chat(request: ChatRequest):
         # --- SCENARIO 1: Image Analysis (use Gemini for vision) ---
         if image_base64:
             print("🖼️ Processing with image...")
+            from services.gemini_service import get_gemini_response
             response = await get_gemini_response(user_message, image_base64)
             return {"response": response, "mode": "image"}
         
         # --- SCENARIO 2: Document Upload (process and store) ---
         if document and mode == "document":
             print(f"📄 Processing document: {document.get('name')}")
+            from services.document_service import process_document
+            from services.token_service import build_document_index
             
             # Extract text from document
             document_text = process_document(document)
@@ -75,20 +93,18 @@ async def handle_chat(request: ChatRequest):
             if document_text.startswith("[Error"):
                 return {"response": document_text, "mode": "error"}
             
-            # Store in session
-            active_documents[session_id] = document_text
-            
-            # Create a summary for quick response
-            doc_summary = summarize_document(document_text, max_chars=3000)
+            # Store in session, with token counts computed once per upload
+            document_index = build_document_index(document_text)
+            active_documents[session_id] = document_index
             
-            print(f"✓ Document processed: {len(document_text)} chars")
+            print(f"✓ Document processed: {len(document_text)} chars, ~{document_index['tokens']} tokens")
             
             # Initial response about the document
             initial_response = f"""✅ Document loaded successfully! 
 
 📊 **Stats:**
 - File: {document.get('name')}
-- Size: {len(document_text)} characters
+- Size: {len(document_text)} characters (~{document_index['tokens']} tokens)
 - Ready for questions!
 
 Ask me anything about this document!"""
@@ -99,21 +115,37 @@ Ask me anything about this document!"""
                 "document_loaded": True
             }
         
+        # --- FAST PATH: Trivial intents (no LLM round trip) ---
+        intent = classify_intent(user_message)
+        if intent:
+            print(f"⚡ Fast-path intent: {intent}")
+            return {"response": get_template_response(intent), "mode": "template"}
+        
         # --- SCENARIO 3: Document Q&A (use stored document context) ---
         if mode == "document" and session_id in active_documents:
             print(f"📖 Answering from document context...")
+            from services.document_service import summarize_document_full
+            from services.token_service import select_context, context_token_budget, DOCUMENT_MAX_COMPLETION_TOKENS
+            from services.groq_service import DOCUMENT_PROMPT_TOKENS
+            
+            document_index = active_documents[session_id]
             
-            document_context = active_documents[session_id]
+            # Whole-document summary: map-reduce over all chunks (cached by hash)
+            if is_summary_request(user_message):
+                summary = await summarize_document_full(document_index["text"])
+                if summary:
+                    return {
+                        "response": summary,
+                        "mode": "document"
+                    }
             
-            # For long documents, create a smart summary
-            if len(document_context) > 8000:
-                # Use a more aggressive summary for very long docs
-                context_summary = summarize_document(document_context, max_chars=6000)
-            else:
-                context_summary = document_context
+            # Send only as much context as the token budget allows
+            budget = context_token_budget(user_message, DOCUMENT_PROMPT_TOKENS, DOCUMENT_MAX_COMPLETION_TOKENS)
+            document_context, context_tokens = select_context(document_index, user_message, budget)
+            print(f"📏 Context: ~{context_tokens}/{document_index['tokens']} tokens")
             
             # Use Groq with document context (FAST + ACCURATE)
-            response = await get_groq_response(user_message, context_summary)
+            response = await get_groq_response(user_message, document_context)
             
             return {
                 "response": response,
@@ -121,8 +153,10 @@ Ask me anything about this document!"""
             }
         
         # --- SCENARIO 4: Regular Chat (use Groq for speed) ---
-        print("💬 Regular chat mode...")
-        response = await get_groq_response(user_message)
+        # Short factual questions go to the small model, complex ones to 70b
+        model = route_model(user_message)
+        print(f"💬 Regular chat mode ({model})...")
+        response = await get_groq_response(user_message, model=model)
         return {"response": response, "mode": "chat"}
     
     except Exception as e:
@@ -135,8 +169,19 @@ Ask me anything about this document!"""
 
 # --- VOICE ENDPOINT (Uses Groq for speed) ---
 @app.post("/api/voice")
-async def handle_voice(file: UploadFile = File(...)):
-    """Handle voice input. Uses Groq for ultra-fast responses."""
+async def handle_voice(file: UploadFile = File(...), response_mode: str = "json"):
+    """
+    Handle voice input. Uses Groq for ultra-fast responses.
+    
+    response_mode:
+    - "json": audio as base64 inside JSON (legacy)
+    - "binary": raw WAV body, transcript and text in X-Transcript / X-Text-Response headers
+    - "url": small JSON with an audio_url to fetch from the short-lived audio store.
+      The store is in-process, so this mode only works on a single long-running
+      server; on Vercel serverless the audio fetch may hit another instance and 404.
+    """
+    from services.voice_service import transcribe_audio, speak_text
+
     try:
         # 1. Read audio
         audio_data = await file.read()
@@ -164,6 +209,25 @@ async def handle_voice(file: UploadFile = File(...)):
         print(f"✅ Audio: {len(audio_response_bytes)} bytes")
 
         # 5. Return everything
+        if response_mode == "binary":
+            # Send the TTS bytes as-is (no base64 copy, no JSON encode)
+            return Response(
+                content=audio_response_bytes,
+                media_type="audio/wav",
+                headers={
+                    "X-Transcript": quote(transcript),
+                    "X-Text-Response": quote(text_response),
+                }
+            )
+        
+        if response_mode == "url":
+            blob_id = put_audio(audio_response_bytes)
+            return {
+                "transcript": transcript,
+                "text_response": text_response,
+                "audio_url": f"/api/voice/audio/{blob_id}"
+            }
+        
         audio_response_b64 = base64.b64encode(audio_response_bytes).decode('utf-8')
         
         return {
@@ -177,6 +241,15 @@ async def handle_voice(file: UploadFile = File(...)):
         return {"error": str(e)}
 
 
+@app.get("/api/voice/audio/{blob_id}")
+async def get_voice_audio(blob_id: str):
+    """Serve a voice reply stored by /api/voice?response_mode=url (same instance only)."""
+    audio_bytes = get_audio(blob_id)
+    if audio_bytes is None:
+        return Response(status_code=404)
+    return Response(content=audio_bytes, media_type="audio/wav")
+
+
 # --- DOCUMENT MANAGEMENT ENDPOINTS ---
 
 @app.post("/api/document/clear")
@@ -192,11 +265,13 @@ async def clear_document(session_id: str = "default"):
 async def document_status(session_id: str = "default"):
     """Check if document is loaded in session."""
     has_document = session_id in active_documents
-    doc_length = len(active_documents.get(session_id, "")) if has_document else 0
+    doc_length = len(active_documents[session_id]["text"]) if has_document else 0
+    doc_tokens = active_documents[session_id]["tokens"] if has_document else 0
     
     return {
         "has_document": has_document,
         "document_length": doc_length,
+        "document_tokens": doc_tokens,
         "session_id": session_id
     }
 
@@ -220,4 +295,12 @@ def health_check():
     return {
         "status": "healthy",
         "active_documents": len(active_documents)
+    }
+
+
+@app.get("/api/metrics")
+def metrics():
+    """Routing decisions of the intent fast-path."""
+    return {
+        "intent_routing": get_intent_metrics()
     }
\ No newline at end of file
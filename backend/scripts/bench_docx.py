@@ -0,0 +1,110 @@
+"""
+DOCX extraction benchmark: streaming iterparse extractor vs python-docx.
+
+Builds a synthetic document (paragraphs + tables) with python-docx, then
+measures for each extractor:
+- throughput (MB of .docx per second)
+- peak Python memory during extraction (tracemalloc)
+- characters extracted (python-docx path only reads doc.paragraphs)
+
+Note: tracemalloc only sees Python allocations. python-docx builds its
+tree in lxml (C memory), so its real peak is higher than reported.
+
+Requires python-docx (only for building the file and the comparison):
+    pip install python-docx
+
+Usage (from backend/):
+    python scripts/bench_docx.py [--paragraphs 5000] [--tables 200] [--runs 5]
+"""
+import argparse
+import contextlib
+import io
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+from services.document_service import extract_text_from_docx
+
+
+def build_docx(paragraphs: int, tables: int) -> bytes:
+    import docx
+
+    doc = docx.Document()
+    doc.sections[0].header.paragraphs[0].text = "CodeKivy - Python Course Notes"
+    table_every = max(paragraphs // max(tables, 1), 1)
+
+    for i in range(paragraphs):
+        doc.add_paragraph(
+            f"Paragraph {i}: Python lists are ordered, mutable sequences. "
+            "Use append() to add items and slicing to copy them."
+        )
+        if tables and i % table_every == 0:
+            table = doc.add_table(rows=4, cols=3)
+            for r, row in enumerate(table.rows):
+                for c, cell in enumerate(row.cells):
+                    cell.text = f"T{i} r{r} c{c} value"
+
+    buffer = io.BytesIO()
+    doc.save(buffer)
+    return buffer.getvalue()
+
+
+def extract_with_python_docx(file_data: bytes) -> str:
+    """The previous implementation (paragraphs only)."""
+    import docx
+
+    doc = docx.Document(io.BytesIO(file_data))
+    return "\n".join(p.text for p in doc.paragraphs if p.text.strip())
+
+
+def measure(extractor, file_data: bytes, runs: int) -> dict:
+    times, peaks = [], []
+    text = ""
+    for _ in range(runs):
+        tracemalloc.start()
+        t0 = time.perf_counter()
+        # Extractors print progress; keep the table readable
+        with contextlib.redirect_stdout(io.StringIO()):
+            text = extractor(file_data)
+        times.append(time.perf_counter() - t0)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        peaks.append(peak / (1024 * 1024))
+
+    size_mb = len(file_data) / (1024 * 1024)
+    median_s = statistics.median(times)
+    return {
+        "ms": median_s * 1000,
+        "mb_per_s": size_mb / median_s,
+        "peak_mb": statistics.median(peaks),
+        "chars": len(text),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare DOCX extractors")
+    parser.add_argument("--paragraphs", type=int, default=5000)
+    parser.add_argument("--tables", type=int, default=200)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    try:
+        file_data = build_docx(args.paragraphs, args.tables)
+    except ImportError:
+        print("python-docx is required for this benchmark: pip install python-docx")
+        return
+
+    print(f"document: {len(file_data) / 1024:.0f} KB, {args.paragraphs} paragraphs, {args.tables} tables")
+    print(f"{'extractor':<14}{'median ms':>12}{'MB/s':>10}{'peak MB':>10}{'chars':>12}")
+    for name, extractor in (("streaming", extract_text_from_docx), ("python-docx", extract_with_python_docx)):
+        result = measure(extractor, file_data, args.runs)
+        print(f"{name:<14}{result['ms']:>12.1f}{result['mb_per_s']:>10.2f}{result['peak_mb']:>10.1f}{result['chars']:>12}")
+
+
+if __name__ == "__main__":
+    main()
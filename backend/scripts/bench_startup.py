@@ -0,0 +1,109 @@
+"""
+Cold-start benchmark for the CodeKivy backend.
+
+Each scenario runs in a fresh Python process (like a new serverless
+instance) and measures:
+- import time of `main` (module load, app creation)
+- latency of the first request to the route
+
+API keys are cleared in the child process, so services return early
+and no network calls are made - only local work is measured.
+
+Usage (from backend/):
+    python scripts/bench_startup.py [--runs 5]
+"""
+import argparse
+import base64
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SAMPLE_TXT = base64.b64encode(b"Python lists are mutable sequences. " * 50).decode()
+
+# name -> (method, path, kwargs for httpx)
+SCENARIOS = {
+    "health": ("GET", "/health", {}),
+    "chat_template": ("POST", "/api/chat", {"json": {"message": "hi"}}),
+    "chat_llm": ("POST", "/api/chat", {"json": {"message": "What is a Python list?"}}),
+    "document_upload": ("POST", "/api/chat", {"json": {
+        "message": "Uploaded a document",
+        "mode": "document",
+        "session_id": "bench",
+        "document": {"name": "bench.txt", "type": "text/plain", "data": SAMPLE_TXT, "size": 1800},
+    }}),
+    "document_status": ("GET", "/api/document/status", {"params": {"session_id": "bench"}}),
+    "voice": ("POST", "/api/voice", {"files": {"file": ("bench.webm", b"\x00" * 1024, "audio/webm")}}),
+}
+
+
+def run_child(scenario: str) -> None:
+    """Runs inside the fresh process: import the app and hit one route."""
+    import asyncio
+
+    start = time.perf_counter()
+    import main
+    import_ms = (time.perf_counter() - start) * 1000
+
+    import httpx
+
+    method, path, kwargs = SCENARIOS[scenario]
+
+    async def first_request():
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            t0 = time.perf_counter()
+            response = await client.request(method, path, **kwargs)
+            return (time.perf_counter() - t0) * 1000, response.status_code
+
+    request_ms, status = asyncio.run(first_request())
+    print(json.dumps({
+        "import_ms": import_ms,
+        "request_ms": request_ms,
+        "status": status,
+        "modules": len(sys.modules),
+    }))
+
+
+def run_scenario(scenario: str) -> dict:
+    env = dict(os.environ)
+    for key in ("GROQ_API_KEY", "GEMINI_API_KEY", "DEEPGRAM_API_KEY"):
+        env[key] = ""
+    result = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "--child", scenario],
+        cwd=BACKEND_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    # Services print progress; the JSON result is the last line
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Measure cold-start import and first-request latency")
+    parser.add_argument("--runs", type=int, default=5, help="fresh processes per scenario")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        sys.path.insert(0, BACKEND_DIR)
+        run_child(args.child)
+        return
+
+    print(f"{'scenario':<18}{'import ms':>12}{'first req ms':>15}{'modules':>10}")
+    for scenario in SCENARIOS:
+        samples = [run_scenario(scenario) for _ in range(args.runs)]
+        import_ms = statistics.median(s["import_ms"] for s in samples)
+        request_ms = statistics.median(s["request_ms"] for s in samples)
+        modules = samples[-1]["modules"]
+        print(f"{scenario:<18}{import_ms:>12.1f}{request_ms:>15.1f}{modules:>10}")
+
+
+if __name__ == "__main__":
+    main()
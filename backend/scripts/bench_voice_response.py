@@ -0,0 +1,97 @@
+"""
+Voice reply benchmark: legacy base64 JSON vs binary vs audio URL.
+
+Deepgram and Groq are replaced with local stubs that return a fixed
+transcript, text and WAV payload, so only the response path is measured:
+- wall time per /api/voice request
+- peak Python memory allocated during the request (tracemalloc)
+
+Usage (from backend/):
+    python scripts/bench_voice_response.py [--audio-kb 512] [--runs 20]
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+import httpx
+
+import main
+from services import voice_service
+
+TRANSCRIPT = "What is a Python dictionary?"
+TEXT_RESPONSE = "A dictionary stores key value pairs. You create one with curly braces."
+
+
+def install_stubs(audio_bytes: bytes):
+    """Replace upstream calls with instant local stubs."""
+    async def fake_transcribe(audio_data: bytes) -> str:
+        return TRANSCRIPT
+
+    async def fake_speak(text: str) -> bytes:
+        return audio_bytes
+
+    async def fake_groq_voice(user_message: str) -> str:
+        return TEXT_RESPONSE
+
+    voice_service.transcribe_audio = fake_transcribe
+    voice_service.speak_text = fake_speak
+    main.get_groq_voice_response = fake_groq_voice
+
+
+async def measure(client: httpx.AsyncClient, mode: str, runs: int) -> dict:
+    files = {"file": ("bench.webm", b"\x00" * 1024, "audio/webm")}
+    times, peaks = [], []
+
+    for _ in range(runs):
+        tracemalloc.start()
+        t0 = time.perf_counter()
+        response = await client.post("/api/voice", params={"response_mode": mode}, files=files)
+        if mode == "url":
+            audio_url = response.json()["audio_url"]
+            response = await client.get(audio_url)
+        elapsed = (time.perf_counter() - t0) * 1000
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        response.raise_for_status()
+        times.append(elapsed)
+        peaks.append(peak / 1024)
+
+    return {"ms": statistics.median(times), "peak_kb": statistics.median(peaks)}
+
+
+async def run(audio_kb: int, runs: int):
+    audio_bytes = os.urandom(audio_kb * 1024)
+    install_stubs(audio_bytes)
+
+    transport = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        # Warm up imports and route compilation
+        # (the handler prints progress; keep the table readable)
+        with contextlib.redirect_stdout(io.StringIO()):
+            for mode in ("json", "binary", "url"):
+                await measure(client, mode, 1)
+
+        print(f"audio reply: {audio_kb} KB, {runs} runs per mode")
+        print(f"{'mode':<10}{'median ms':>12}{'peak KB':>12}")
+        for mode in ("json", "binary", "url"):
+            with contextlib.redirect_stdout(io.StringIO()):
+                result = await measure(client, mode, runs)
+            print(f"{mode:<10}{result['ms']:>12.2f}{result['peak_kb']:>12.0f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare voice reply encodings")
+    parser.add_argument("--audio-kb", type=int, default=512, help="size of the stub TTS reply")
+    parser.add_argument("--runs", type=int, default=20)
+    args = parser.parse_args()
+    asyncio.run(run(args.audio_kb, args.runs))
@@ -0,0 +1,238 @@
+"""
+Replay a recorded traffic log against the app with mock upstreams.
+
+The log is written by the opt-in recorder middleware
+(RECORD_REQUESTS=1, see services/recorder_service.py). Payloads are
+rebuilt from the recorded shape (sizes, mode, session, routing), so no
+user content is needed. Groq, Gemini and Deepgram are replaced by local
+stubs with configurable latency, and requests are sent in-process at the
+recorded arrival times (optionally sped up or slowed down).
+
+Usage (from backend/):
+    python scripts/replay_requests.py requests.jsonl
+    python scripts/replay_requests.py requests.jsonl --speed 4 --save after.json
+    python scripts/replay_requests.py requests.jsonl --compare before.json
+
+Limitations: documents are replayed as plain text of the same size (PDF
+parsing cost is not reproduced), and message text is synthetic, so only
+the routing recorded in the shape (template, summary or LLM) is preserved.
+"""
+import argparse
+import asyncio
+import base64
+import contextlib
+import io
+import json
+import os
+import random
+import statistics
+import sys
+import time
+from collections import defaultdict
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+# Never record while replaying
+os.environ.pop("RECORD_REQUESTS", None)
+
+import httpx
+
+import main
+from services import gemini_service, groq_service, voice_service
+
+
+def install_mock_upstreams(groq_ms: float, gemini_ms: float, deepgram_ms: float, jitter: float):
+    """Replace every upstream call with a sleep of the configured latency."""
+    async def wait(ms: float):
+        await asyncio.sleep(ms * random.uniform(1 - jitter, 1 + jitter) / 1000)
+
+    async def fake_groq(user_message, document_context=None, model=None):
+        await wait(groq_ms)
+        return "Mock answer from Groq."
+
+    async def fake_groq_voice(user_message):
+        await wait(groq_ms)
+        return "Mock voice answer."
+
+    async def fake_groq_summary(text, merge=False, model=None):
+        await wait(groq_ms)
+        return "Mock partial summary."
+
+    async def fake_gemini(user_message, image_base64=None):
+        await wait(gemini_ms)
+        return "Mock answer from Gemini."
+
+    async def fake_transcribe(audio_data):
+        await wait(deepgram_ms)
+        return "mock transcript"
+
+    async def fake_speak(text):
+        await wait(deepgram_ms)
+        return b"RIFF" + b"\x00" * 64 * 1024
+
+    main.get_groq_response = fake_groq
+    main.get_groq_voice_response = fake_groq_voice
+    groq_service.get_groq_summary = fake_groq_summary
+    gemini_service.get_gemini_response = fake_gemini
+    voice_service.transcribe_audio = fake_transcribe
+    voice_service.speak_text = fake_speak
+
+
+def load_records(path: str) -> list:
+    records = []
+    with open(path, encoding="utf-8") as log_file:
+        for line in log_file:
+            line = line.strip()
+            if line:
+                records.append(json.loads(line))
+    records.sort(key=lambda record: record["t"])
+    return records
+
+
+def _synthetic_document(size_b64: int, seed: str) -> str:
+    """Base64 text document of about the recorded encoded size."""
+    raw_size = size_b64 * 3 // 4
+    sentence = f"Section {seed}: Python lists, tuples and dictionaries store collections. "
+    text = (sentence * (raw_size // len(sentence) + 1))[:raw_size]
+    return base64.b64encode(text.encode()).decode()
+
+
+def build_request(record: dict) -> dict:
+    """Turn a recorded shape back into httpx request arguments."""
+    shape = record.get("shape", {})
+    session = f"replay-{shape.get('session', 'default')}"
+    request = {"method": record["method"], "url": record["path"], "params": dict(record.get("query", {}))}
+
+    if record["path"] == "/api/chat":
+        if shape.get("response_mode") == "template":
+            message = "hi"
+        elif shape.get("summary"):
+            message = "Summarize this document"
+        else:
+            message = " ".join(["python"] * max(shape.get("message_words", 1), 1))
+        payload = {"message": message, "mode": shape.get("mode", "chat"), "session_id": session}
+        if shape.get("image_bytes"):
+            payload["image"] = "data:image/jpeg;base64," + "A" * shape["image_bytes"]
+        if shape.get("document_bytes"):
+            payload["document"] = {
+                "name": "replay.txt",
+                "type": "text/plain",
+                "data": _synthetic_document(shape["document_bytes"], shape.get("session", "")),
+                "size": shape["document_bytes"] * 3 // 4,
+            }
+        request["json"] = payload
+    elif record["path"] == "/api/voice":
+        request["files"] = {"file": ("replay.webm", b"\x00" * max(record.get("req_bytes", 0) - 200, 1), "audio/webm")}
+    else:
+        request["params"]["session_id"] = session
+
+    return request
+
+
+def route_key(record: dict) -> str:
+    mode = record.get("shape", {}).get("response_mode")
+    return f"{record['path']} [{mode}]" if mode else record["path"]
+
+
+async def replay(records: list, speed: float) -> dict:
+    """Send every request at its (scaled) recorded offset and collect latencies."""
+    latencies = defaultdict(list)
+    t0 = records[0]["t"]
+
+    transport = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://replay", timeout=120) as client:
+        start = time.perf_counter()
+
+        async def fire(record: dict):
+            delay = (record["t"] - t0) / speed - (time.perf_counter() - start)
+            if delay > 0:
+                await asyncio.sleep(delay)
+            request = build_request(record)
+            sent = time.perf_counter()
+            await client.request(**request)
+            latencies[route_key(record)].append((time.perf_counter() - sent) * 1000)
+
+        await asyncio.gather(*(fire(record) for record in records))
+
+    return dict(latencies)
+
+
+def percentile(values: list, pct: float) -> float:
+    ordered = sorted(values)
+    index = min(int(round(pct / 100 * (len(ordered) - 1))), len(ordered) - 1)
+    return ordered[index]
+
+
+def summarize(latencies: dict) -> dict:
+    return {
+        route: {
+            "n": len(values),
+            "p50": percentile(values, 50),
+            "p90": percentile(values, 90),
+            "p99": percentile(values, 99),
+            "mean": statistics.mean(values),
+        }
+        for route, values in sorted(latencies.items())
+    }
+
+
+def print_table(title: str, stats: dict, baseline: dict = None):
+    print(f"\n{title}")
+    print(f"{'route':<34}{'n':>6}{'p50 ms':>10}{'p90 ms':>10}{'p99 ms':>10}" + ("   Δp50     Δp99" if baseline else ""))
+    for route, row in stats.items():
+        line = f"{route:<34}{row['n']:>6}{row['p50']:>10.1f}{row['p90']:>10.1f}{row['p99']:>10.1f}"
+        if baseline and route in baseline:
+            base = baseline[route]
+            line += f"{row['p50'] - base['p50']:>+8.1f}{row['p99'] - base['p99']:>+9.1f}"
+        print(line)
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description="Replay recorded traffic against mock upstreams")
+    parser.add_argument("log", help="JSONL log written by the recorder middleware")
+    parser.add_argument("--speed", type=float, default=1.0, help="arrival rate multiplier (2 = twice as fast)")
+    parser.add_argument("--groq-ms", type=float, default=400, help="mock Groq latency")
+    parser.add_argument("--gemini-ms", type=float, default=1500, help="mock Gemini latency")
+    parser.add_argument("--deepgram-ms", type=float, default=300, help="mock Deepgram latency (per call)")
+    parser.add_argument("--jitter", type=float, default=0.2, help="± fraction applied to mock latencies")
+    parser.add_argument("--save", help="write replay latency stats to this JSON file")
+    parser.add_argument("--compare", help="stats JSON from an earlier --save run to diff against")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    records = load_records(args.log)
+    if not records:
+        print("No records to replay.")
+        return
+
+    install_mock_upstreams(args.groq_ms, args.gemini_ms, args.deepgram_ms, args.jitter)
+
+    span = records[-1]["t"] - records[0]["t"]
+    print(f"Replaying {len(records)} requests over {span / args.speed:.1f}s (speed x{args.speed})")
+
+    # The app logs every step; keep the report readable
+    with contextlib.redirect_stdout(io.StringIO()):
+        latencies = asyncio.run(replay(records, args.speed))
+
+    recorded = defaultdict(list)
+    for record in records:
+        recorded[route_key(record)].append(record["ms"])
+    print_table("Recorded (production upstreams)", summarize(recorded))
+
+    stats = summarize(latencies)
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as compare_file:
+            baseline = json.load(compare_file)
+    print_table("Replay (mock upstreams)", stats, baseline)
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as save_file:
+            json.dump(stats, save_file, indent=2)
+        print(f"\nSaved replay stats to {args.save}")
+
+
+if __name__ == "__main__":
+    main_cli()
@@ -0,0 +1,51 @@
+import secrets
+import time
+from typing import Optional, Dict, Tuple
+
+# Short-lived in-memory store for generated voice replies.
+# Key: blob_id, Value: (expires_at, audio_bytes)
+#
+# LIMITATION: the store lives in one process. On Vercel serverless the
+# follow-up GET /api/voice/audio/{id} can land on a different (or freshly
+# cold-started) instance and get a 404. Only use response_mode=url on a
+# single long-running server; the deployed frontend uses binary mode.
+audio_blobs: Dict[str, Tuple[float, bytes]] = {}
+
+# Replies are fetched right after the /api/voice response, so keep them briefly
+AUDIO_TTL_SECONDS = 120
+MAX_AUDIO_BLOBS = 50
+
+
+def _purge_expired(now: float):
+    """Drop expired blobs (called on every write)."""
+    expired = [blob_id for blob_id, (expires_at, _) in audio_blobs.items() if expires_at <= now]
+    for blob_id in expired:
+        del audio_blobs[blob_id]
+
+
+def put_audio(audio_bytes: bytes) -> str:
+    """Store audio bytes (no copy) and return an unguessable id."""
+    now = time.monotonic()
+    _purge_expired(now)
+
+    # Limit store size (drop the oldest reply)
+    if len(audio_blobs) >= MAX_AUDIO_BLOBS:
+        oldest_key = next(iter(audio_blobs))
+        del audio_blobs[oldest_key]
+
+    blob_id = secrets.token_urlsafe(16)
+    audio_blobs[blob_id] = (now + AUDIO_TTL_SECONDS, audio_bytes)
+    return blob_id
+
+
+def get_audio(blob_id: str) -> Optional[bytes]:
+    """Return stored audio, or None if unknown or expired."""
+    entry = audio_blobs.get(blob_id)
+    if entry is None:
+        return None
+
+    expires_at, audio_bytes = entry
+    if expires_at <= time.monotonic():
+        del audio_blobs[blob_id]
+        return None
+    return audio_bytes
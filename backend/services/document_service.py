@@ -1,17 +1,47 @@
 import os
+import asyncio
 import base64
 import hashlib
+import re
+import zipfile
+import xml.etree.ElementTree as ET
 from typing import Optional, Dict
 from io import BytesIO
-import PyPDF2
-import docx
-from dotenv import load_dotenv
 
-load_dotenv()
+# WordprocessingML tags used by the streaming DOCX extractor
+_W_NS = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+_W_P = f"{_W_NS}p"
+_W_T = f"{_W_NS}t"
+_W_TAB = f"{_W_NS}tab"
+_W_BR = f"{_W_NS}br"
+_W_CR = f"{_W_NS}cr"
+_W_TBL = f"{_W_NS}tbl"
+_W_TR = f"{_W_NS}tr"
+_W_TC = f"{_W_NS}tc"
+# Tracked moves keep the old copy in w:moveFrom; only read the w:moveTo copy
+_W_MOVE_FROM = f"{_W_NS}moveFrom"
+# Text boxes are written twice (mc:Choice and mc:Fallback); only read the choice
+_MC_FALLBACK = "{http://schemas.openxmlformats.org/markup-compatibility/2006}Fallback"
+# Subtrees whose text is a duplicate of text elsewhere in the part
+_SKIPPED_SUBTREES = (_MC_FALLBACK, _W_MOVE_FROM)
 
 # In-memory cache for parsed documents (faster than re-parsing)
 document_cache: Dict[str, str] = {}
 
+# In-memory cache for full document summaries, keyed by text hash
+# (shared across sessions, so the same file is only summarized once)
+summary_cache: Dict[str, str] = {}
+
+# Map-reduce summarization settings
+SUMMARY_CHUNK_CHARS = 6000
+SUMMARY_CHUNK_OVERLAP = 200
+MAX_PARALLEL_SUMMARIES = 4
+
+# One semaphore shared by every summary job, so concurrent users together
+# never have more than MAX_PARALLEL_SUMMARIES Groq calls in flight
+_summary_semaphore: Optional[asyncio.Semaphore] = None
+_summary_semaphore_loop = None
+
 def get_document_hash(document_data: str) -> str:
     """Generate a hash for caching purposes."""
     return hashlib.md5(document_data.encode()).hexdigest()
@@ -22,6 +52,9 @@ def extract_text_from_pdf(file_data: bytes) -> str:
     Optimized for speed - uses PyPDF2 for fast extraction.
     """
     try:
+        # Imported on first use to keep serverless cold starts fast
+        import PyPDF2
+
         pdf_file = BytesIO(file_data)
         pdf_reader = PyPDF2.PdfReader(pdf_file)
         
@@ -44,16 +77,37 @@ def extract_text_from_pdf(file_data: bytes) -> str:
 def extract_text_from_docx(file_data: bytes) -> str:
     """
     Extract text from DOCX file.
-    Fast extraction using python-docx.
+    Streams the XML parts from the zip with iterparse instead of building
+    the python-docx object model. Keeps paragraphs and tables in document
+    order, plus headers, footers, footnotes and endnotes.
     """
     try:
-        docx_file = BytesIO(file_data)
-        doc = docx.Document(docx_file)
-        
-        text_parts = []
-        for paragraph in doc.paragraphs:
-            if paragraph.text.strip():
-                text_parts.append(paragraph.text)
+        with zipfile.ZipFile(BytesIO(file_data)) as docx_zip:
+            names = docx_zip.namelist()
+            
+            headers = _numbered_parts(names, "header")
+            footers = _numbered_parts(names, "footer")
+            notes = [n for n in ("word/footnotes.xml", "word/endnotes.xml") if n in names]
+            
+            text_parts = []
+            # Headers/footers repeat per section; keep each distinct line once
+            seen = set()
+            for part_name in headers:
+                for line in _iter_docx_part_text(docx_zip, part_name):
+                    if line not in seen:
+                        seen.add(line)
+                        text_parts.append(line)
+            
+            text_parts.extend(_iter_docx_part_text(docx_zip, "word/document.xml"))
+            
+            for part_name in footers:
+                for line in _iter_docx_part_text(docx_zip, part_name):
+                    if line not in seen:
+                        seen.add(line)
+                        text_parts.append(line)
+            
+            for part_name in notes:
+                text_parts.extend(_iter_docx_part_text(docx_zip, part_name))
         
         full_text = "\n".join(text_parts)
         print(f"✓ Extracted {len(full_text)} characters from DOCX")
@@ -63,6 +117,92 @@ def extract_text_from_docx(file_data: bytes) -> str:
         print(f"❌ DOCX extraction error: {e}")
         return f"[Error: Could not read DOCX - {str(e)}]"
 
+def _numbered_parts(names, prefix: str) -> list:
+    """Part names like word/header2.xml, sorted by number (header10 after header2)."""
+    parts = []
+    for name in names:
+        match = re.match(rf"word/{prefix}(\d*)\.xml$", name)
+        if match:
+            parts.append((int(match.group(1) or 0), name))
+    return [name for _, name in sorted(parts)]
+
+def _iter_docx_part_text(docx_zip: zipfile.ZipFile, part_name: str):
+    """
+    Yield the non-empty lines of one WordprocessingML part, in order.
+    Paragraphs become lines; each table row becomes one line with cells
+    joined by " | ". Elements are cleared as soon as they are consumed.
+    mc:Fallback and w:moveFrom subtrees are skipped so text boxes and
+    tracked moves are not read twice.
+    """
+    paragraph_stack = []  # text runs of each open paragraph (text boxes nest)
+    row_stack = []        # cells of each open table row
+    cell_stack = []       # paragraph texts of each open table cell
+    element_stack = []
+    skip_depth = 0
+    
+    with docx_zip.open(part_name) as part:
+        for event, elem in ET.iterparse(part, events=("start", "end")):
+            tag = elem.tag
+            
+            if tag in _SKIPPED_SUBTREES:
+                skip_depth += 1 if event == "start" else -1
+                continue
+            if skip_depth:
+                continue
+            
+            if event == "start":
+                element_stack.append(elem)
+                if tag == _W_P:
+                    paragraph_stack.append([])
+                elif tag == _W_TR:
+                    row_stack.append([])
+                elif tag == _W_TC:
+                    cell_stack.append([])
+                continue
+            
+            element_stack.pop()
+            line = None
+            
+            if tag == _W_T:
+                if paragraph_stack and elem.text:
+                    paragraph_stack[-1].append(elem.text)
+            elif tag == _W_TAB:
+                if paragraph_stack:
+                    paragraph_stack[-1].append("\t")
+            elif tag in (_W_BR, _W_CR):
+                if paragraph_stack:
+                    paragraph_stack[-1].append("\n")
+            elif tag == _W_P:
+                text = "".join(paragraph_stack.pop())
+                if paragraph_stack:
+                    # Text box inside a paragraph: keep it with the outer paragraph
+                    paragraph_stack[-1].append(" " + text)
+                elif cell_stack:
+                    cell_stack[-1].append(text)
+                else:
+                    line = text
+            elif tag == _W_TC:
+                cell_text = " ".join(t.strip() for t in cell_stack.pop() if t.strip())
+                if row_stack:
+                    row_stack[-1].append(cell_text)
+            elif tag == _W_TR:
+                cells = row_stack.pop()
+                row_text = " | ".join(cells) if any(cells) else ""
+                if cell_stack:
+                    # Nested table: the row belongs to the enclosing cell
+                    cell_stack[-1].append(row_text)
+                else:
+                    line = row_text
+            
+            if tag in (_W_P, _W_TR, _W_TBL):
+                elem.clear()
+                # Detach finished blocks so the tree never grows
+                if element_stack:
+                    element_stack[-1].remove(elem)
+            
+            if line and line.strip():
+                yield line
+
 def extract_text_from_txt(file_data: bytes) -> str:
     """
     Extract text from TXT file.
@@ -147,26 +287,123 @@ def process_document(document: Dict) -> str:
         print(f"❌ Document processing error: {e}")
         return f"[Error: Failed to process document - {str(e)}]"
 
-def summarize_document(text: str, max_chars: int = 2000) -> str:
+def split_into_chunks(text: str, chunk_chars: int = SUMMARY_CHUNK_CHARS, overlap: int = SUMMARY_CHUNK_OVERLAP) -> list:
     """
-    Create a quick summary of the document for context.
-    Used to give LLM a preview without overwhelming it.
+    Split text into chunks of about chunk_chars.
+    Prefers paragraph, then line, then sentence boundaries so chunks stay readable.
     """
-    if len(text) <= max_chars:
-        return text
+    if len(text) <= chunk_chars:
+        return [text]
+    
+    chunks = []
+    start = 0
+    while start < len(text):
+        end = min(start + chunk_chars, len(text))
+        if end < len(text):
+            # Look for a natural break in the second half of the window
+            window_start = start + chunk_chars // 2
+            for separator in ("\n\n", "\n", ". "):
+                cut = text.rfind(separator, window_start, end)
+                if cut != -1:
+                    end = cut + len(separator)
+                    break
+        
+        chunk = text[start:end].strip()
+        if chunk:
+            chunks.append(chunk)
+        if end >= len(text):
+            break
+        start = max(end - overlap, start + 1)
+    
+    return chunks
+
+def _get_summary_semaphore() -> asyncio.Semaphore:
+    """Shared summary semaphore, recreated only if the event loop changed."""
+    global _summary_semaphore, _summary_semaphore_loop
+    loop = asyncio.get_running_loop()
+    if _summary_semaphore is None or _summary_semaphore_loop is not loop:
+        _summary_semaphore = asyncio.Semaphore(MAX_PARALLEL_SUMMARIES)
+        _summary_semaphore_loop = loop
+    return _summary_semaphore
+
+async def summarize_document_full(text: str) -> Optional[str]:
+    """
+    Summarize the whole document with map-reduce:
+    1. Split into chunks and summarize them concurrently (bounded parallelism)
+    2. Merge the partial summaries hierarchically until one remains
+    
+    Results are cached by text hash, only when every Groq call succeeded.
+    Returns None if any chunk or merge failed, so the caller can fall back.
+    """
+    from services.groq_service import get_groq_summary, GROQ_MODEL_LARGE
+    
+    doc_hash = get_document_hash(text)
+    if doc_hash in summary_cache:
+        print("✓ Using cached summary")
+        return summary_cache[doc_hash]
+    
+    semaphore = _get_summary_semaphore()
+    
+    async def summarize(part: str, merge: bool, final: bool = False) -> str:
+        async with semaphore:
+            if final:
+                return await get_groq_summary(part, merge=merge, model=GROQ_MODEL_LARGE)
+            return await get_groq_summary(part, merge=merge)
+    
+    # Map: summarize every chunk
+    chunks = split_into_chunks(text)
+    print(f"📚 Summarizing {len(chunks)} chunks...")
+    
+    if len(chunks) == 1:
+        summaries = [await summarize(chunks[0], merge=False, final=True)]
+    else:
+        summaries = await asyncio.gather(*(summarize(chunk, merge=False) for chunk in chunks))
+    
+    # A missing chunk would make the summary silently incomplete
+    if not all(summaries):
+        print(f"❌ Summarization failed for {summaries.count('')} of {len(chunks)} chunks")
+        return None
+    
+    # Reduce: merge groups of summaries until they fit in one call
+    while len(summaries) > 1:
+        groups = []
+        current = []
+        current_len = 0
+        for summary in summaries:
+            if current and current_len + len(summary) > SUMMARY_CHUNK_CHARS:
+                groups.append(current)
+                current, current_len = [], 0
+            current.append(summary)
+            current_len += len(summary)
+        groups.append(current)
+        
+        # Guarantee progress even if every summary is oversized
+        if len(groups) == len(summaries):
+            groups = [summaries[i:i + 2] for i in range(0, len(summaries), 2)]
+        
+        is_final = len(groups) == 1
+        merged = await asyncio.gather(*(
+            summarize("\n\n---\n\n".join(group), merge=True, final=is_final) for group in groups
+        ))
+        if not all(merged):
+            print("❌ Summary merge failed")
+            return None
+        summaries = merged
+    
+    final_summary = summaries[0]
+    summary_cache[doc_hash] = final_summary
     
-    # Take beginning, middle, and end sections
-    section_size = max_chars // 3
-    beginning = text[:section_size]
-    middle_start = len(text) // 2 - section_size // 2
-    middle = text[middle_start:middle_start + section_size]
-    end = text[-section_size:]
+    # Limit cache size (keep last 50 summaries)
+    if len(summary_cache) > 50:
+        oldest_key = next(iter(summary_cache))
+        del summary_cache[oldest_key]
     
-    summary = f"{beginning}\n\n[...middle section...]\n\n{middle}\n\n[...end section...]\n\n{end}"
-    return summary
+    print(f"✓ Summary ready: {len(final_summary)} characters")
+    return final_summary
 
 def clear_document_cache():
-    """Clear the document cache (can be called periodically)."""
+    """Clear the document and summary caches (can be called periodically)."""
     global document_cache
     document_cache.clear()
+    summary_cache.clear()
     print("✓ Document cache cleared")
\ No newline at end of file
@@ -1,9 +1,6 @@
 import httpx
 import json
 import os
-from dotenv import load_dotenv
-
-load_dotenv()
 
 # The system prompt to define the bot's persona for CodeKivy
 CODEKIVY_SYSTEM_PROMPT = """
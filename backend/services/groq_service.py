@@ -1,9 +1,16 @@
 import httpx
 import json
 import os
-from dotenv import load_dotenv
 
-load_dotenv()
+from services.token_service import (
+    estimate_tokens,
+    CHAT_MAX_COMPLETION_TOKENS,
+    DOCUMENT_MAX_COMPLETION_TOKENS,
+)
+
+# Models: 70b for complex questions, 8b-instant for short factual ones
+GROQ_MODEL_LARGE = "llama-3.3-70b-versatile"
+GROQ_MODEL_FAST = "llama-3.1-8b-instant"
 
 # System prompt for general chat
 CODEKIVY_CHAT_PROMPT = """You are "KivyBot," the official assistant for CodeKivy, a Python-focused EdTech platform.
@@ -31,6 +38,9 @@ DOCUMENT ANALYSIS RULES:
 If the user asks something not in the document, politely say: "I couldn't find that information in the uploaded document."
 """
 
+# Prompt tokens counted once at import (system prompt + document wrapper)
+DOCUMENT_PROMPT_TOKENS = estimate_tokens(CODEKIVY_DOCUMENT_PROMPT) + 25
+
 # System prompt for voice (shorter responses)
 CODEKIVY_VOICE_PROMPT = """You are "KivyBot," a Python tutor for CodeKivy.
 
@@ -42,8 +52,17 @@ VOICE MODE RULES:
 
 Focus on Python learning. Keep it brief and clear for voice."""
 
+# System prompt for chunked (map-reduce) document summaries
+CODEKIVY_SUMMARY_PROMPT = """You are "KivyBot," a document summarizer for CodeKivy.
+
+SUMMARY RULES:
+1. Use ONLY the text provided. Do not add outside knowledge.
+2. Keep key facts, definitions, numbers and code concepts.
+3. Use short bullet points grouped under clear headings.
+4. Never mention that the text was split into sections."""
 
-async def get_groq_response(user_message: str, document_context: str = None) -> str:
+
+async def get_groq_response(user_message: str, document_context: str = None, model: str = GROQ_MODEL_LARGE) -> str:
     """
     Get ultra-fast response from Groq API.
     Supports both regular chat and document-based questions.
@@ -51,6 +70,7 @@ async def get_groq_response(user_message: str, document_context: str = None) ->
     Args:
         user_message: The user's question
         document_context: Optional document text for context
+        model: Groq model to use (defaults to 70b)
     
     Returns:
         AI response text
@@ -63,7 +83,7 @@ async def get_groq_response(user_message: str, document_context: str = None) ->
     url = "https://api.groq.com/openai/v1/chat/completions"
     
     # Choose system prompt based on context
-    if document_context:
+    if document_context is not None:
         system_prompt = CODEKIVY_DOCUMENT_PROMPT
         # Add document context to the user message
         enhanced_message = f"""Document Content:
@@ -72,14 +92,14 @@ async def get_groq_response(user_message: str, document_context: str = None) ->
 User Question: {user_message}
 
 Please answer based ONLY on the document content above."""
-        max_tokens = 500  # Allow longer responses for document analysis
+        max_tokens = DOCUMENT_MAX_COMPLETION_TOKENS  # Allow longer responses for document analysis
     else:
         system_prompt = CODEKIVY_CHAT_PROMPT
         enhanced_message = user_message
-        max_tokens = 300
+        max_tokens = CHAT_MAX_COMPLETION_TOKENS
     
     payload = {
-        "model": "llama-3.3-70b-versatile",  # Fast and accurate
+        "model": model,
         "messages": [
             {"role": "system", "content": system_prompt},
             {"role": "user", "content": enhanced_message}
@@ -134,7 +154,7 @@ async def get_groq_voice_response(user_message: str) -> str:
     url = "https://api.groq.com/openai/v1/chat/completions"
     
     payload = {
-        "model": "llama-3.3-70b-versatile",
+        "model": GROQ_MODEL_LARGE,
         "messages": [
             {"role": "system", "content": CODEKIVY_VOICE_PROMPT},
             {"role": "user", "content": user_message}
@@ -167,4 +187,60 @@ async def get_groq_voice_response(user_message: str) -> str:
             
     except Exception as e:
         print(f"Groq voice error: {e}")
-        return "Sorry, something went wrong."
\ No newline at end of file
+        return "Sorry, something went wrong."
+
+
+async def get_groq_summary(text: str, merge: bool = False, model: str = GROQ_MODEL_FAST) -> str:
+    """
+    Summarize one chunk of a document (map step) or combine
+    partial summaries into one (reduce step).
+    
+    Returns:
+        Summary text, or an empty string if the call failed
+    """
+    api_key = os.getenv("GROQ_API_KEY", "")
+    
+    if not api_key:
+        return ""
+    
+    url = "https://api.groq.com/openai/v1/chat/completions"
+    
+    if merge:
+        instruction = "Combine these partial summaries of one document into a single coherent summary:"
+    else:
+        instruction = "Summarize this section of a document:"
+    
+    payload = {
+        "model": model,
+        "messages": [
+            {"role": "system", "content": CODEKIVY_SUMMARY_PROMPT},
+            {"role": "user", "content": f"{instruction}\n\n{text}"}
+        ],
+        "temperature": 0.2,
+        "max_tokens": 700 if merge else 400,
+        "stream": False
+    }
+    
+    headers = {
+        "Authorization": f"Bearer {api_key}",
+        "Content-Type": "application/json"
+    }
+    
+    try:
+        async with httpx.AsyncClient() as client:
+            response = await client.post(
+                url,
+                headers=headers,
+                json=payload,
+                timeout=30.0
+            )
+            
+            response.raise_for_status()
+            result = response.json()
+            
+            text = result["choices"][0]["message"]["content"]
+            return text.strip()
+            
+    except Exception as e:
+        print(f"Groq summary error: {e}")
+        return ""
@@ -0,0 +1,219 @@
+import math
+import random
+import re
+from collections import Counter
+from typing import Optional, Dict
+
+from services.groq_service import GROQ_MODEL_FAST, GROQ_MODEL_LARGE
+
+# --- TRIVIAL INTENT TEMPLATES ---
+# Answered locally, no LLM round trip needed.
+INTENT_TEMPLATES: Dict[str, list] = {
+    "greeting": [
+        "Hi there! 👋 I'm KivyBot, your Python tutor at CodeKivy. What would you like to learn today?",
+        "Hello! I'm KivyBot. Ask me anything about Python and I'll help you out!",
+    ],
+    "thanks": [
+        "You're welcome! 😊 Let me know if you have any other Python questions.",
+        "Happy to help! Keep up the great work with your Python learning!",
+    ],
+    "ack": [
+        "Great! 👍 Feel free to ask your next Python question whenever you're ready.",
+        "Awesome! What would you like to explore next?",
+    ],
+    "goodbye": [
+        "Goodbye! 👋 Happy coding, and come back anytime you need help with Python!",
+        "See you later! Keep practicing - you're doing great!",
+    ],
+}
+
+# Exact-match keyword rules (checked first, cheapest path)
+INTENT_KEYWORDS: Dict[str, set] = {
+    "greeting": {"hi", "hello", "hey", "hii", "hiii", "heya", "yo", "hola", "namaste",
+                 "good morning", "good afternoon", "good evening", "hi there", "hello there",
+                 "hey there", "hi kivybot", "hello kivybot", "hey kivybot"},
+    "thanks": {"thanks", "thank you", "thx", "ty", "thanks a lot", "thank you so much",
+               "thanks so much", "many thanks", "thank u", "tysm", "much appreciated"},
+    "ack": {"ok", "okay", "k", "kk", "cool", "nice", "great", "got it", "alright",
+            "sure", "fine", "understood", "makes sense", "i see", "awesome", "perfect"},
+    "goodbye": {"bye", "goodbye", "bye bye", "see you", "see ya", "cya", "good night",
+                "see you later", "talk later", "later"},
+}
+
+# Seed phrases for the vectorized fallback (catches typos / small variations)
+INTENT_EXAMPLES: Dict[str, list] = {
+    "greeting": ["hi", "hello", "hey there", "hello kivybot", "good morning", "hiya", "helo"],
+    "thanks": ["thanks", "thank you", "thank you very much", "thanks for the help", "thankyou", "thnks"],
+    "ack": ["ok", "okay", "got it", "cool thanks", "alright", "okie", "ok got it"],
+    "goodbye": ["bye", "goodbye", "see you later", "bye for now", "gotta go"],
+}
+
+# Messages longer than this always go to the LLM
+MAX_TRIVIAL_WORDS = 5
+# Minimum cosine similarity for the vectorized classifier
+SIMILARITY_THRESHOLD = 0.6
+
+# Short factual questions go to the small model; anything longer or code-related uses 70b
+MAX_FAST_MODEL_WORDS = 12
+# Matched at the start of a word ("errors", "classes"); a trailing space means whole word only
+COMPLEX_HINTS = ("explain", "why", "difference", "compare", "debug", "error", "fix",
+                 "write", "code", "implement", "optimize", "example", "step by step",
+                 "traceback", "exception", "how does", "how do i",
+                 "create", "class", "function", "def ", "program")
+
+# Words that ask for a whole-document summary (document mode only).
+# Multi-word phrases are joined into one token before matching.
+SUMMARY_WORDS = {"summarize", "summarise", "summary", "summarization", "summarisation",
+                 "tldr", "overview", "gist", "recap", "keypoints", "mainpoints"}
+SUMMARY_PHRASES = {"tl dr": "tldr", "key points": "keypoints", "main points": "mainpoints"}
+# Filler that may surround a whole-document summary request.
+# Anything else ("chapter 3", "table", "show") makes it a targeted question.
+SUMMARY_FILLER = {"please", "pls", "can", "could", "would", "you", "u", "i", "want", "need",
+                  "give", "get", "me", "us", "write", "provide", "make", "do", "a", "an", "the",
+                  "this", "that", "it", "its", "whole", "entire", "full", "overall", "document",
+                  "doc", "file", "pdf", "text", "uploaded", "of", "for", "on", "from", "in",
+                  "short", "brief", "quick", "what", "are", "is", "kivybot", "now", "all",
+                  # Format and length modifiers ("in 3 bullet points", "in simple words")
+                  "bullet", "bullets", "point", "points", "line", "lines", "word", "words",
+                  "sentence", "sentences", "paragraph", "paragraphs", "few", "under", "max",
+                  "maximum", "at", "most", "within", "into", "using", "with", "format",
+                  "simple", "easy", "plain", "terms", "language", "english",
+                  # Whole-document nouns (plural only: "chapter 3" stays targeted)
+                  "notes", "chapters", "pages", "sections", "content", "contents"}
+
+# Routing metrics (in production, export to Prometheus or similar)
+intent_metrics: Dict[str, int] = {
+    "total": 0,
+    "template_keyword": 0,
+    "template_vector": 0,
+    "llm_fast": 0,
+    "llm_large": 0,
+    "document_summary": 0,
+}
+
+_WORD_RE = re.compile(r"[a-z0-9']+")
+
+
+def normalize_message(message: str) -> str:
+    """Lowercase and strip punctuation/emoji so keyword rules match reliably."""
+    return " ".join(_WORD_RE.findall(message.lower()))
+
+
+def _vectorize(text: str) -> Dict[str, float]:
+    """Character-trigram vector, L2-normalized. Tiny and CPU-only."""
+    padded = f"  {text} "
+    counts = Counter(padded[i:i + 3] for i in range(len(padded) - 2))
+    norm = math.sqrt(sum(v * v for v in counts.values())) or 1.0
+    return {k: v / norm for k, v in counts.items()}
+
+
+def _cosine(a: Dict[str, float], b: Dict[str, float]) -> float:
+    if len(a) > len(b):
+        a, b = b, a
+    return sum(v * b.get(k, 0.0) for k, v in a.items())
+
+
+def _build_centroids() -> Dict[str, Dict[str, float]]:
+    """Average the seed phrase vectors into one centroid per intent."""
+    centroids = {}
+    for intent, examples in INTENT_EXAMPLES.items():
+        total: Counter = Counter()
+        for example in examples:
+            total.update(_vectorize(example))
+        norm = math.sqrt(sum(v * v for v in total.values())) or 1.0
+        centroids[intent] = {k: v / norm for k, v in total.items()}
+    return centroids
+
+
+# Built once at import time (a few dozen short strings, well under a millisecond)
+_INTENT_CENTROIDS = _build_centroids()
+
+
+def classify_intent(message: str) -> Optional[str]:
+    """
+    Detect trivial intents (greeting, thanks, ack, goodbye).
+    Returns the intent name, or None if the message needs the LLM.
+    """
+    intent_metrics["total"] += 1
+    normalized = normalize_message(message)
+    if not normalized or len(normalized.split()) > MAX_TRIVIAL_WORDS:
+        return None
+
+    # 1. Keyword rules
+    for intent, keywords in INTENT_KEYWORDS.items():
+        if normalized in keywords:
+            intent_metrics["template_keyword"] += 1
+            return intent
+
+    # 2. Vectorized fallback
+    vector = _vectorize(normalized)
+    best_intent, best_score = None, 0.0
+    for intent, centroid in _INTENT_CENTROIDS.items():
+        score = _cosine(vector, centroid)
+        if score > best_score:
+            best_intent, best_score = intent, score
+
+    if best_score >= SIMILARITY_THRESHOLD:
+        intent_metrics["template_vector"] += 1
+        return best_intent
+    return None
+
+
+def get_template_response(intent: str) -> str:
+    """Pick a canned reply for a trivial intent."""
+    return random.choice(INTENT_TEMPLATES[intent])
+
+
+def route_model(message: str) -> str:
+    """
+    Pick the Groq model for a real question.
+    Short factual questions use the small fast model, complex ones use 70b.
+    """
+    normalized = normalize_message(message)
+    padded = f" {normalized} "
+    is_complex = (
+        len(normalized.split()) > MAX_FAST_MODEL_WORDS
+        or "```" in message
+        or "\n" in message.strip()
+        or any(f" {hint}" in padded for hint in COMPLEX_HINTS)
+    )
+
+    if is_complex:
+        intent_metrics["llm_large"] += 1
+        return GROQ_MODEL_LARGE
+    intent_metrics["llm_fast"] += 1
+    return GROQ_MODEL_FAST
+
+
+def wants_document_summary(message: str) -> bool:
+    """
+    True if the message is mainly a request to summarize the whole document.
+    Matches whole words only; targeted questions ("summarize chapter 3",
+    "what does the summary table show?") return False.
+    """
+    normalized = f" {normalize_message(message)} "
+    for phrase, token in SUMMARY_PHRASES.items():
+        normalized = normalized.replace(f" {phrase} ", f" {token} ")
+
+    words = normalized.split()
+    if not any(word in SUMMARY_WORDS for word in words):
+        return False
+    return all(word in SUMMARY_WORDS or word in SUMMARY_FILLER or word.isdigit() for word in words)
+
+
+def is_summary_request(message: str) -> bool:
+    """Same as wants_document_summary, counted in the routing metrics."""
+    if wants_document_summary(message):
+        intent_metrics["document_summary"] += 1
+        return True
+    return False
+
+
+def get_intent_metrics() -> Dict:
+    """Snapshot of routing decisions, including the share answered locally."""
+    templated = intent_metrics["template_keyword"] + intent_metrics["template_vector"]
+    total = intent_metrics["total"] or 1
+    return {
+        **intent_metrics,
+        "template_rate": round(templated / total, 3),
+    }
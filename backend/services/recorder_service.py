@@ -0,0 +1,233 @@
+import hashlib
+import hmac
+import json
+import os
+import random
+import re
+import secrets
+import time
+from typing import Dict, Optional
+from urllib.parse import parse_qs
+
+from starlette.concurrency import run_in_threadpool
+
+from services.intent_service import wants_document_summary
+
+# --- REQUEST RECORDER (opt-in, for offline replay) ---
+# Enable with RECORD_REQUESTS=1. Records the *shape* of sampled requests
+# (sizes, mode, keyed session ids, timing), never message text, images, documents or audio.
+RECORD_SAMPLE_RATE = float(os.getenv("RECORD_SAMPLE_RATE", "0.1"))
+# /tmp is the only writable path on Vercel
+RECORD_LOG_PATH = os.getenv("RECORD_LOG_PATH", "/tmp/codekivy_requests.jsonl")
+# Per-deployment secret for session ids. Without it a random per-process key
+# is used, so ids only correlate within one instance.
+RECORD_HASH_KEY = (os.getenv("RECORD_HASH_KEY") or secrets.token_hex(32)).encode()
+
+RECORDED_PATHS = ("/api/chat", "/api/voice", "/api/document/")
+# Audio blob fetches follow /api/voice and carry one-off ids; not replayable
+SKIPPED_PATHS = ("/api/voice/audio/",)
+
+# Only small JSON responses are inspected (to read the "mode" field)
+MAX_INSPECTED_RESPONSE_BYTES = 64 * 1024
+# Chat bodies up to this size are parsed fully. Larger ones (base64 uploads)
+# are never buffered: only the first/last EDGE_BYTES are kept and scanned.
+MAX_PARSED_REQUEST_BYTES = 64 * 1024
+EDGE_BYTES = 4096
+
+_JSON_STRING = r'"((?:[^"\\]|\\.)*)"'
+
+
+def hash_value(value: str) -> str:
+    """Short keyed id (HMAC-SHA256) so session ids can't be recovered by guessing."""
+    return hmac.new(RECORD_HASH_KEY, value.encode(), hashlib.sha256).hexdigest()[:16]
+
+
+def _should_sample(key: Optional[str]) -> bool:
+    """
+    Sample by session when possible, so a recorded session keeps its
+    document upload together with the follow-up questions.
+    """
+    if RECORD_SAMPLE_RATE >= 1:
+        return True
+    if key:
+        bucket = int(hashlib.sha256(key.encode()).hexdigest()[:8], 16) / 0xFFFFFFFF
+        return bucket < RECORD_SAMPLE_RATE
+    return random.random() < RECORD_SAMPLE_RATE
+
+
+def _chat_shape(body: bytes) -> Dict:
+    """Redacted description of a /api/chat payload."""
+    try:
+        payload = json.loads(body)
+    except ValueError:
+        return {}
+
+    message = payload.get("message") or ""
+    document = payload.get("document") or {}
+    image = payload.get("image") or ""
+    return {
+        "mode": payload.get("mode") or "chat",
+        "session": hash_value(payload.get("session_id") or "default"),
+        "message_chars": len(message),
+        "message_words": len(message.split()),
+        "summary": wants_document_summary(message),
+        "image_bytes": len(image),
+        "document_type": document.get("type"),
+        "document_bytes": len(document.get("data") or ""),
+    }
+
+
+def _json_field(text: str, key: str) -> Optional[str]:
+    """Read one string field from a JSON fragment without parsing the whole body."""
+    match = re.search(rf'"{key}"\s*:\s*{_JSON_STRING}', text)
+    if not match:
+        return None
+    try:
+        return json.loads(f'"{match.group(1)}"')
+    except ValueError:
+        return None
+
+
+def _chat_shape_from_edges(head: bytes, tail: bytes, request_bytes: int) -> Dict:
+    """
+    Redacted description of a large /api/chat payload (an image or document
+    upload), built from the first and last bytes of the body only.
+    Upload sizes are approximated by the body size.
+    """
+    head_text = head.decode("utf-8", errors="ignore")
+    tail_text = tail.decode("utf-8", errors="ignore")
+
+    message = _json_field(head_text, "message") or ""
+    mode = _json_field(tail_text, "mode") or _json_field(head_text, "mode") or "chat"
+    session = _json_field(tail_text, "session_id") or _json_field(head_text, "session_id") or "default"
+    has_image = re.search(r'"image"\s*:\s*"', head_text) is not None
+    document_at = re.search(r'"document"\s*:\s*\{', head_text)
+
+    return {
+        "mode": mode,
+        "session": hash_value(session),
+        "message_chars": len(message),
+        "message_words": len(message.split()),
+        "summary": wants_document_summary(message),
+        "image_bytes": request_bytes if has_image else 0,
+        "document_type": _json_field(head_text[document_at.end():], "type") if document_at else None,
+        "document_bytes": request_bytes if document_at and not has_image else 0,
+    }
+
+
+def write_record(record: Dict):
+    """Append one record as a compact JSON line."""
+    line = json.dumps(record, separators=(",", ":"))
+    try:
+        with open(RECORD_LOG_PATH, "a", encoding="utf-8") as log_file:
+            log_file.write(line + "\n")
+    except OSError as e:
+        print(f"❌ Recorder write error: {e}")
+
+
+class RequestRecorder:
+    """
+    ASGI middleware that records sampled requests to an append-only log.
+    Request and response bodies are observed as they stream through
+    (no extra reads or copies for the app); large uploads are not buffered.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        path = scope.get("path", "")
+        if scope["type"] != "http" or not path.startswith(RECORDED_PATHS) or path.startswith(SKIPPED_PATHS):
+            await self.app(scope, receive, send)
+            return
+
+        query = parse_qs(scope.get("query_string", b"").decode())
+        session = None
+        if path.startswith("/api/document/"):
+            session = hash_value(query.get("session_id", ["default"])[0])
+
+        # Chat requests carry the session in the body; decide after reading it
+        is_chat = path == "/api/chat"
+        if not is_chat and not _should_sample(session):
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        started_at = time.time()
+        request = {"bytes": 0, "chunks": [], "head": b"", "tail": b""}
+        response = {"status": 0, "bytes": 0, "json": False, "chunks": []}
+
+        async def recording_receive():
+            message = await receive()
+            if message["type"] == "http.request" and is_chat:
+                body = message.get("body", b"")
+                request["bytes"] += len(body)
+                if len(request["head"]) < EDGE_BYTES:
+                    request["head"] += body[:EDGE_BYTES - len(request["head"])]
+                request["tail"] = (request["tail"] + body[-EDGE_BYTES:])[-EDGE_BYTES:]
+                if request["bytes"] <= MAX_PARSED_REQUEST_BYTES:
+                    request["chunks"].append(body)
+                else:
+                    request["chunks"] = None
+            elif message["type"] == "http.request":
+                request["bytes"] += len(message.get("body", b""))
+            return message
+
+        async def recording_send(message):
+            if message["type"] == "http.response.start":
+                response["status"] = message["status"]
+                headers = dict(message.get("headers", []))
+                response["json"] = headers.get(b"content-type", b"").startswith(b"application/json")
+            elif message["type"] == "http.response.body":
+                body = message.get("body", b"")
+                response["bytes"] += len(body)
+                if response["json"] and response["bytes"] <= MAX_INSPECTED_RESPONSE_BYTES:
+                    response["chunks"].append(body)
+            await send(message)
+
+        try:
+            await self.app(scope, recording_receive, recording_send)
+        except Exception:
+            # Unhandled errors become a 500 from the server; record them as such
+            if not response["status"]:
+                response["status"] = 500
+            raise
+        finally:
+            duration_ms = (time.perf_counter() - start) * 1000
+            await self._record(scope, path, query, session, is_chat, request, response, started_at, duration_ms)
+
+    async def _record(self, scope, path, query, session, is_chat, request, response, started_at, duration_ms):
+        shape = {}
+        if is_chat:
+            if request["chunks"] is not None:
+                shape = _chat_shape(b"".join(request["chunks"]))
+            else:
+                shape = _chat_shape_from_edges(request["head"], request["tail"], request["bytes"])
+            if not _should_sample(shape.get("session")):
+                return
+        elif session:
+            shape["session"] = session
+
+        # Which branch answered (template / chat / document / image / error)
+        if response["chunks"] and response["bytes"] <= MAX_INSPECTED_RESPONSE_BYTES:
+            try:
+                response_mode = json.loads(b"".join(response["chunks"])).get("mode")
+            except (ValueError, AttributeError):
+                response_mode = None
+            if response_mode:
+                shape["response_mode"] = response_mode
+
+        query.pop("session_id", None)
+        record = {
+            "t": round(started_at, 3),
+            "method": scope["method"],
+            "path": path,
+            "query": {key: values[0] for key, values in query.items()},
+            "status": response["status"],
+            "ms": round(duration_ms, 2),
+            "req_bytes": request["bytes"],
+            "resp_bytes": response["bytes"],
+            "shape": shape,
+        }
+        # File I/O off the event loop
+        await run_in_threadpool(write_record, record)
@@ -0,0 +1,110 @@
+import os
+import re
+from typing import Dict, List, Tuple
+
+# --- TOKEN BUDGET SETTINGS (override via environment) ---
+# Total tokens per document request (system + context + question + completion).
+# Limits how much document context is sent; completion caps stay fixed.
+REQUEST_TOKEN_BUDGET = int(os.getenv("REQUEST_TOKEN_BUDGET", "2400"))
+# Completion caps (max_tokens sent to Groq)
+CHAT_MAX_COMPLETION_TOKENS = int(os.getenv("CHAT_MAX_COMPLETION_TOKENS", "300"))
+DOCUMENT_MAX_COMPLETION_TOKENS = int(os.getenv("DOCUMENT_MAX_COMPLETION_TOKENS", "500"))
+
+# Size of the chunks stored with each document for context selection
+CONTEXT_CHUNK_CHARS = 1200
+
+# Llama-style BPE: common words are ~1 token, long words add one every ~6 chars,
+# punctuation and symbols are usually their own token.
+_TOKEN_RE = re.compile(r"[A-Za-z]+|\d+|[^\sA-Za-z\d]")
+
+_STOPWORDS = {
+    "the", "a", "an", "is", "are", "was", "were", "of", "to", "in", "on", "for",
+    "and", "or", "what", "which", "who", "how", "why", "does", "do", "this",
+    "that", "it", "be", "with", "as", "by", "about", "document", "me", "tell",
+}
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Approximate the Llama 3 token count of text without a tokenizer.
+    Typically within ~10% for English prose and code.
+    """
+    if not text:
+        return 0
+    count = 0
+    for piece in _TOKEN_RE.findall(text):
+        if piece[0].isalpha():
+            count += 1 + (len(piece) - 1) // 6
+        elif piece[0].isdigit():
+            count += (len(piece) + 2) // 3
+        else:
+            count += 1
+    return count
+
+
+def build_document_index(text: str) -> Dict:
+    """
+    Precompute token statistics once at extraction time.
+
+    Returns:
+        Dict with 'text', 'tokens' and 'chunks' (list of {'text', 'tokens'})
+    """
+    # Imported here to avoid a circular import (document_service uses this module)
+    from services.document_service import split_into_chunks
+
+    chunks = [
+        {"text": chunk, "tokens": estimate_tokens(chunk)}
+        for chunk in split_into_chunks(text, chunk_chars=CONTEXT_CHUNK_CHARS, overlap=0)
+    ]
+    return {
+        "text": text,
+        "tokens": sum(chunk["tokens"] for chunk in chunks),
+        "chunks": chunks,
+    }
+
+
+def _keywords(text: str) -> set:
+    return {
+        word for word in re.findall(r"[a-z0-9_]+", text.lower())
+        if len(word) > 2 and word not in _STOPWORDS
+    }
+
+
+def select_context(document_index: Dict, question: str, token_budget: int) -> Tuple[str, int]:
+    """
+    Pick document chunks that fit token_budget.
+    The whole document is used when it fits; otherwise chunks are ranked by
+    keyword overlap with the question (ties keep document order) and
+    returned in document order. The best-ranked chunk is always included,
+    even when the question alone uses up the budget.
+
+    Returns:
+        (context_text, context_tokens)
+    """
+    if document_index["tokens"] <= token_budget:
+        return document_index["text"], document_index["tokens"]
+
+    chunks: List[Dict] = document_index["chunks"]
+    question_words = _keywords(question)
+    ranked = sorted(
+        range(len(chunks)),
+        key=lambda i: (-len(question_words & _keywords(chunks[i]["text"])), i),
+    )
+
+    selected = []
+    used = 0
+    for i in ranked:
+        if selected and used + chunks[i]["tokens"] > token_budget:
+            continue
+        selected.append(i)
+        used += chunks[i]["tokens"]
+
+    selected.sort()
+    context = "\n\n[...]\n\n".join(chunks[i]["text"] for i in selected)
+    return context, used
+
+
+def context_token_budget(question: str, prompt_overhead_tokens: int, max_completion: int) -> int:
+    """Tokens left for document context after prompt, question and completion."""
+    return max(0, REQUEST_TOKEN_BUDGET - prompt_overhead_tokens - estimate_tokens(question) - max_completion)
+
@@ -1,9 +1,6 @@
 import asyncio
 import os
 import httpx
-from dotenv import load_dotenv
-
-load_dotenv()
 
 # --- OPTIMIZED TRANSCRIPTION ---
 
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Make `services` importable when running pytest from backend/
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,90 @@
+from urllib.parse import unquote
+
+import pytest
+from fastapi.testclient import TestClient
+
+from services import audio_store, voice_service
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Empty store and a controllable time.monotonic()."""
+    monkeypatch.setattr(audio_store, "audio_blobs", {})
+    now = {"t": 1000.0}
+    monkeypatch.setattr(audio_store.time, "monotonic", lambda: now["t"])
+    return now
+
+
+def test_blob_is_served_until_it_expires(clock):
+    blob_id = audio_store.put_audio(b"RIFF-reply")
+    clock["t"] += audio_store.AUDIO_TTL_SECONDS - 1
+    assert audio_store.get_audio(blob_id) == b"RIFF-reply"
+
+    clock["t"] += 1
+    assert audio_store.get_audio(blob_id) is None
+    assert blob_id not in audio_store.audio_blobs
+
+
+def test_expired_blobs_are_purged_on_write(clock):
+    old_id = audio_store.put_audio(b"old")
+    clock["t"] += audio_store.AUDIO_TTL_SECONDS
+    new_id = audio_store.put_audio(b"new")
+    assert list(audio_store.audio_blobs) == [new_id]
+    assert audio_store.get_audio(old_id) is None
+
+
+def test_oldest_blob_is_evicted_when_full(clock, monkeypatch):
+    monkeypatch.setattr(audio_store, "MAX_AUDIO_BLOBS", 3)
+    ids = [audio_store.put_audio(bytes([i])) for i in range(4)]
+
+    assert len(audio_store.audio_blobs) == 3
+    assert audio_store.get_audio(ids[0]) is None
+    assert [audio_store.get_audio(blob_id) for blob_id in ids[1:]] == [b"\x01", b"\x02", b"\x03"]
+
+
+def test_unknown_blob_is_none(clock):
+    assert audio_store.get_audio("missing") is None
+
+
+@pytest.fixture
+def voice_client(monkeypatch):
+    """App client with Deepgram and Groq replaced by fixed replies."""
+    import main
+
+    async def fake_transcribe(audio_data):
+        return "Qu'est-ce qu'une liste? 🐍"
+
+    async def fake_voice_response(user_message):
+        return "Une liste est mutable — 列表 «ok»\nsecond line"
+
+    async def fake_speak(text):
+        return b"RIFF\x00\x01\x02"
+
+    monkeypatch.setattr(voice_service, "transcribe_audio", fake_transcribe)
+    monkeypatch.setattr(voice_service, "speak_text", fake_speak)
+    monkeypatch.setattr(main, "get_groq_voice_response", fake_voice_response)
+    monkeypatch.setattr(audio_store, "audio_blobs", {})
+    return TestClient(main.app)
+
+
+def test_binary_mode_headers_round_trip(voice_client):
+    response = voice_client.post(
+        "/api/voice?response_mode=binary",
+        files={"file": ("voice.webm", b"\x00" * 16, "audio/webm")},
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "audio/wav"
+    assert response.content == b"RIFF\x00\x01\x02"
+    # The frontend reads these with decodeURIComponent
+    assert unquote(response.headers["x-transcript"]) == "Qu'est-ce qu'une liste? 🐍"
+    assert unquote(response.headers["x-text-response"]) == "Une liste est mutable — 列表 «ok»\nsecond line"
+
+
+def test_url_mode_serves_audio_once_stored(voice_client):
+    response = voice_client.post(
+        "/api/voice?response_mode=url",
+        files={"file": ("voice.webm", b"\x00" * 16, "audio/webm")},
+    )
+    audio_url = response.json()["audio_url"]
+    assert voice_client.get(audio_url).content == b"RIFF\x00\x01\x02"
+    assert voice_client.get("/api/voice/audio/missing").status_code == 404
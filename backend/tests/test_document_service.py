@@ -0,0 +1,166 @@
+import asyncio
+import io
+import zipfile
+
+from services import document_service, groq_service
+from services.document_service import extract_text_from_docx, split_into_chunks, summarize_document_full
+
+
+def _long_text(sections: int = 12) -> str:
+    return "\n\n".join(f"Section {i}. " + "Python lists store items. " * 220 for i in range(sections))
+
+
+def test_split_into_chunks_covers_text():
+    text = _long_text(3)
+    chunks = split_into_chunks(text, chunk_chars=1000, overlap=0)
+    assert len(chunks) > 1
+    assert all(len(chunk) <= 1000 for chunk in chunks)
+    assert "".join(chunks).replace(" ", "") == text.replace("\n", "").replace(" ", "")
+
+
+def test_partial_summary_failure_is_not_cached(monkeypatch):
+    document_service.summary_cache.clear()
+    calls = {"map": 0}
+
+    async def flaky_summary(text, merge=False, model=None):
+        if not merge:
+            calls["map"] += 1
+            if calls["map"] % 3 == 0:
+                return ""  # e.g. a Groq 429
+        return "partial summary"
+
+    monkeypatch.setattr(groq_service, "get_groq_summary", flaky_summary)
+    text = _long_text()
+
+    assert asyncio.run(summarize_document_full(text)) is None
+    assert document_service.summary_cache == {}
+
+
+def test_complete_summary_is_cached(monkeypatch):
+    document_service.summary_cache.clear()
+
+    async def summary(text, merge=False, model=None):
+        return "merged" if merge else "partial"
+
+    monkeypatch.setattr(groq_service, "get_groq_summary", summary)
+    text = _long_text()
+
+    assert asyncio.run(summarize_document_full(text)) == "merged"
+    assert list(document_service.summary_cache.values()) == ["merged"]
+
+
+_W = 'xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"'
+_MC = 'xmlns:mc="http://schemas.openxmlformats.org/markup-compatibility/2006"'
+
+
+def _paragraph(text: str) -> str:
+    return f"<w:p><w:r><w:t>{text}</w:t></w:r></w:p>"
+
+
+def _table(rows) -> str:
+    return "<w:tbl>" + "".join(
+        "<w:tr>" + "".join(f"<w:tc>{cell}</w:tc>" for cell in row) + "</w:tr>" for row in rows
+    ) + "</w:tbl>"
+
+
+def _docx(body: str, footnotes: str = None, parts: dict = None) -> bytes:
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as docx_zip:
+        docx_zip.writestr("word/document.xml", f"<w:document {_W} {_MC}><w:body>{body}</w:body></w:document>")
+        if footnotes is not None:
+            docx_zip.writestr("word/footnotes.xml", f"<w:footnotes {_W}>{footnotes}</w:footnotes>")
+        for name, xml in (parts or {}).items():
+            docx_zip.writestr(name, xml)
+    return buffer.getvalue()
+
+
+def test_docx_text_box_is_read_once():
+    box = (
+        "<w:p><w:r><w:t>Before</w:t></w:r><w:r><mc:AlternateContent>"
+        f"<mc:Choice Requires=\"wps\"><w:txbxContent>{_paragraph('BOXTEXT')}</w:txbxContent></mc:Choice>"
+        f"<mc:Fallback><w:pict><w:txbxContent>{_paragraph('BOXTEXT')}</w:txbxContent></w:pict></mc:Fallback>"
+        "</mc:AlternateContent></w:r></w:p>"
+    )
+    text = extract_text_from_docx(_docx(box + _paragraph("After")))
+    assert text == "Before BOXTEXT\nAfter"
+
+
+def test_docx_tables_in_document_order():
+    inner = _table([[_paragraph("x"), _paragraph("y")]])
+    body = (
+        _paragraph("Intro")
+        + _table([[_paragraph("a"), _paragraph("b")], [_paragraph("c"), inner]])
+        + _paragraph("End")
+    )
+    assert extract_text_from_docx(_docx(body)) == "Intro\na | b\nc | x | y\nEnd"
+
+
+def test_docx_tracked_move_is_read_once():
+    body = (
+        '<w:moveFrom w:id="1" w:author="A"><w:p><w:r><w:t>MOVED</w:t></w:r></w:p></w:moveFrom>'
+        + _paragraph("Middle")
+        + '<w:p><w:moveTo w:id="2" w:author="A"><w:r><w:t>MOVED</w:t></w:r></w:moveTo></w:p>'
+    )
+    assert extract_text_from_docx(_docx(body)) == "Middle\nMOVED"
+
+
+def test_docx_rows_are_freed_as_they_are_emitted(monkeypatch):
+    iterparse = document_service.ET.iterparse
+    rows_held = []
+
+    def tracking_iterparse(source, events):
+        table = None
+        for event, elem in iterparse(source, events):
+            if event == "start" and elem.tag == document_service._W_TBL:
+                table = elem
+            elif event == "start" and elem.tag == document_service._W_TR:
+                rows_held.append(list(table).index(elem))
+            yield event, elem
+
+    monkeypatch.setattr(document_service.ET, "iterparse", tracking_iterparse)
+    rows = [[_paragraph(f"r{i}"), _paragraph("cell")] for i in range(5)]
+    text = extract_text_from_docx(_docx(_table(rows)))
+
+    assert text.splitlines() == [f"r{i} | cell" for i in range(5)]
+    # Earlier rows are already detached when the next one starts
+    assert rows_held == [0] * 5
+
+
+def test_docx_headers_and_footers_in_numeric_order():
+    parts = {}
+    for number in (10, 1, 2):
+        parts[f"word/header{number}.xml"] = f"<w:hdr {_W}>{_paragraph(f'H{number}')}</w:hdr>"
+        parts[f"word/footer{number}.xml"] = f"<w:ftr {_W}>{_paragraph(f'F{number}')}</w:ftr>"
+    text = extract_text_from_docx(_docx(_paragraph("Body"), parts=parts))
+    assert text == "H1\nH2\nH10\nBody\nF1\nF2\nF10"
+
+
+def test_docx_footnotes_skip_separators():
+    footnotes = (
+        '<w:footnote w:type="separator" w:id="-1"><w:p><w:r><w:separator/></w:r></w:p></w:footnote>'
+        '<w:footnote w:type="continuationSeparator" w:id="0"><w:p><w:r><w:continuationSeparator/></w:r></w:p></w:footnote>'
+        f'<w:footnote w:id="1">{_paragraph("See PEP 8.")}</w:footnote>'
+    )
+    text = extract_text_from_docx(_docx(_paragraph("Body"), footnotes))
+    assert text == "Body\nSee PEP 8."
+
+
+def test_summary_parallelism_is_bounded_across_jobs(monkeypatch):
+    document_service.summary_cache.clear()
+    in_flight = {"now": 0, "peak": 0}
+
+    async def slow_summary(text, merge=False, model=None):
+        in_flight["now"] += 1
+        in_flight["peak"] = max(in_flight["peak"], in_flight["now"])
+        await asyncio.sleep(0.01)
+        in_flight["now"] -= 1
+        return "summary"
+
+    monkeypatch.setattr(groq_service, "get_groq_summary", slow_summary)
+
+    async def three_users():
+        texts = [_long_text() + f"\n\nUpload {i}" for i in range(3)]
+        return await asyncio.gather(*(summarize_document_full(text) for text in texts))
+
+    assert asyncio.run(three_users()) == ["summary"] * 3
+    assert in_flight["peak"] == document_service.MAX_PARALLEL_SUMMARIES
@@ -0,0 +1,60 @@
+import asyncio
+import types
+
+from services import groq_service
+
+
+class _FakeResponse:
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return {"choices": [{"message": {"content": "answer"}}]}
+
+
+def _capture_payload(monkeypatch) -> dict:
+    captured = {}
+
+    class FakeClient:
+        def __init__(self, *args, **kwargs):
+            pass
+
+        async def __aenter__(self):
+            return self
+
+        async def __aexit__(self, *args):
+            pass
+
+        async def post(self, url, headers, json, timeout):
+            captured.update(json)
+            return _FakeResponse()
+
+    monkeypatch.setenv("GROQ_API_KEY", "test")
+    monkeypatch.setattr(groq_service, "httpx", types.SimpleNamespace(
+        AsyncClient=FakeClient, HTTPStatusError=groq_service.httpx.HTTPStatusError))
+    return captured
+
+
+def test_empty_document_context_keeps_document_prompt(monkeypatch):
+    payload = _capture_payload(monkeypatch)
+    asyncio.run(groq_service.get_groq_response("What is this?", ""))
+    assert payload["messages"][0]["content"] == groq_service.CODEKIVY_DOCUMENT_PROMPT
+
+
+def test_chat_without_document_uses_chat_prompt(monkeypatch):
+    payload = _capture_payload(monkeypatch)
+    asyncio.run(groq_service.get_groq_response("What is a list?"))
+    assert payload["messages"][0]["content"] == groq_service.CODEKIVY_CHAT_PROMPT
+
+
+def test_long_chat_question_keeps_full_completion_cap(monkeypatch):
+    payload = _capture_payload(monkeypatch)
+    traceback = "Traceback (most recent call last):\n" + "  File \"app.py\", line 1, in run\n" * 400
+    asyncio.run(groq_service.get_groq_response(traceback))
+    assert payload["max_tokens"] == groq_service.CHAT_MAX_COMPLETION_TOKENS
+
+
+def test_document_answer_keeps_full_completion_cap(monkeypatch):
+    payload = _capture_payload(monkeypatch)
+    asyncio.run(groq_service.get_groq_response("Question?", "Document text. " * 2000))
+    assert payload["max_tokens"] == groq_service.DOCUMENT_MAX_COMPLETION_TOKENS
@@ -0,0 +1,115 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from services import intent_service
+from services.groq_service import GROQ_MODEL_FAST, GROQ_MODEL_LARGE
+from services.intent_service import classify_intent, route_model, get_intent_metrics, wants_document_summary
+
+
+@pytest.fixture
+def metrics(monkeypatch):
+    """Fresh routing counters for one test."""
+    counters = {key: 0 for key in intent_service.intent_metrics}
+    monkeypatch.setattr(intent_service, "intent_metrics", counters)
+    return counters
+
+
+@pytest.mark.parametrize("message, intent", [
+    ("hi!", "greeting"),
+    ("Hello there", "greeting"),
+    ("thank you!!", "thanks"),
+    ("ok", "ack"),
+    ("Got it 👍", "ack"),
+    ("bye", "goodbye"),
+])
+def test_keyword_intents(metrics, message, intent):
+    assert classify_intent(message) == intent
+    assert metrics["template_keyword"] == 1
+    assert metrics["template_vector"] == 0
+
+
+@pytest.mark.parametrize("message, intent", [
+    ("thanks bro", "thanks"),
+    ("helo kivybot", "greeting"),
+])
+def test_vector_fallback_intents(metrics, message, intent):
+    assert classify_intent(message) == intent
+    assert metrics["template_keyword"] == 0
+    assert metrics["template_vector"] == 1
+
+
+@pytest.mark.parametrize("message", [
+    "hi, what is a list?",
+    "thanks but it fails",
+    "ok so why does it fail",
+    "What is a decorator in Python?",
+    "",
+])
+def test_questions_are_not_templated(metrics, message):
+    assert classify_intent(message) is None
+    assert metrics["template_keyword"] + metrics["template_vector"] == 0
+
+
+@pytest.mark.parametrize("message, model", [
+    ("what is a tuple", GROQ_MODEL_FAST),
+    ("What is the default value of a dict key?", GROQ_MODEL_FAST),
+    ("how to reverse a string", GROQ_MODEL_FAST),
+    ("Explain closures", GROQ_MODEL_LARGE),
+    ("why do I get these errors?", GROQ_MODEL_LARGE),
+    ("create a class for a bank account with deposit", GROQ_MODEL_LARGE),
+    ("def add(a, b) returns None?", GROQ_MODEL_LARGE),
+    ("a program that prints primes", GROQ_MODEL_LARGE),
+    ("```x = [1, 2]```", GROQ_MODEL_LARGE),
+    ("what are the main built-in data types in python and when should each one be used", GROQ_MODEL_LARGE),
+])
+def test_route_model(metrics, message, model):
+    assert route_model(message) == model
+    assert metrics["llm_fast" if model == GROQ_MODEL_FAST else "llm_large"] == 1
+
+
+def test_metrics_endpoint_counts_routes(metrics, monkeypatch):
+    import main
+
+    async def fake_groq(user_message, document_context=None, model=GROQ_MODEL_LARGE):
+        return f"answer from {model}"
+
+    monkeypatch.setattr(main, "get_groq_response", fake_groq)
+    client = TestClient(main.app)
+    for message in ("hi", "thanks bro", "what is a tuple", "Explain closures"):
+        client.post("/api/chat", json={"message": message})
+
+    routing = client.get("/api/metrics").json()["intent_routing"]
+    assert routing["total"] == 4
+    assert routing["template_keyword"] == 1
+    assert routing["template_vector"] == 1
+    assert routing["llm_fast"] == 1
+    assert routing["llm_large"] == 1
+    assert routing["template_rate"] == 0.5
+
+
+@pytest.mark.parametrize("message", [
+    "Summarize this document",
+    "Can you give me a short summary of the whole PDF?",
+    "tl;dr",
+    "What are the key points of this document?",
+    "give me an overview",
+    "summarize the notes",
+    "Summarize the document in 3 bullet points",
+    "Give me a summary of this document in simple words",
+    "Summarize all chapters in under 200 words",
+])
+def test_whole_document_summary_requests(message):
+    assert wants_document_summary(message)
+
+
+@pytest.mark.parametrize("message", [
+    "What is logistic regression?",
+    "Explain the logistics section",
+    "summarize chapter 3",
+    "what does the summary table show?",
+    "How do I write a summary function in Python?",
+    "summarize page 4",
+    "Summarize the section on decorators",
+])
+def test_summary_false_positives(message):
+    assert not wants_document_summary(message)
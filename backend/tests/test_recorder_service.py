@@ -0,0 +1,76 @@
+import asyncio
+import hashlib
+import base64
+import json
+
+import httpx
+import pytest
+from fastapi import FastAPI
+
+from services import recorder_service
+
+
+@pytest.fixture
+def recorded(tmp_path, monkeypatch):
+    log_path = tmp_path / "requests.jsonl"
+    monkeypatch.setattr(recorder_service, "RECORD_LOG_PATH", str(log_path))
+    monkeypatch.setattr(recorder_service, "RECORD_SAMPLE_RATE", 1.0)
+
+    app = FastAPI()
+
+    @app.post("/api/chat")
+    async def chat(payload: dict):
+        if payload.get("message") == "boom":
+            raise RuntimeError("boom")
+        return {"response": "ok", "mode": payload.get("mode", "chat")}
+
+    app.add_middleware(recorder_service.RequestRecorder)
+
+    def send(payload: dict):
+        async def run():
+            transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                await client.post("/api/chat", json=payload)
+        asyncio.run(run())
+        return [json.loads(line) for line in log_path.read_text().splitlines()]
+
+    return send
+
+
+def test_summary_flag_is_recorded(recorded):
+    records = recorded({"message": "Summarize this document", "mode": "document", "session_id": "s1"})
+    shape = records[-1]["shape"]
+    assert shape["summary"] is True
+    assert shape["response_mode"] == "document"
+    assert "Summarize" not in json.dumps(records[-1])
+
+
+def test_large_upload_shape_from_body_edges(recorded):
+    data = base64.b64encode(b"x" * 300_000).decode()
+    records = recorded({
+        "message": "Uploaded a document",
+        "image": None,
+        "document": {"name": "notes.pdf", "type": "application/pdf", "data": data, "size": 300_000},
+        "mode": "document",
+        "session_id": "s2",
+    })
+    shape = records[-1]["shape"]
+    assert shape["session"] == recorder_service.hash_value("s2")
+    assert shape["document_type"] == "application/pdf"
+    assert shape["document_bytes"] >= len(data)
+    assert shape["message_words"] == 3
+
+
+def test_failed_request_is_still_recorded(recorded):
+    records = recorded({"message": "boom"})
+    assert records[-1]["status"] == 500
+
+
+def test_ids_are_keyed_and_message_is_not_hashed(recorded, monkeypatch):
+    records = recorded({"message": "hi", "session_id": "default"})
+    shape = records[-1]["shape"]
+    assert "message_hash" not in shape
+    assert shape["session"] != hashlib.sha256(b"default").hexdigest()[:16]
+
+    monkeypatch.setattr(recorder_service, "RECORD_HASH_KEY", b"other-deployment")
+    assert recorder_service.hash_value("default") != shape["session"]
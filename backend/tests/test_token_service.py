@@ -0,0 +1,43 @@
+from services.token_service import build_document_index, context_token_budget, estimate_tokens, select_context
+
+
+def _document_index():
+    sections = [f"Section {i}: lists and tuples store values. " * 30 for i in range(20)]
+    sections[7] += " Decorators wrap functions to extend them."
+    return build_document_index("\n\n".join(sections))
+
+
+def test_estimate_tokens():
+    assert estimate_tokens("") == 0
+    assert estimate_tokens("print(x)") == 4
+    assert 8 <= estimate_tokens("Python lists are ordered, mutable sequences of items.") <= 14
+
+
+def test_document_index_counts_chunks():
+    index = _document_index()
+    assert len(index["chunks"]) > 1
+    assert index["tokens"] == sum(chunk["tokens"] for chunk in index["chunks"])
+
+
+def test_small_document_is_sent_whole():
+    index = build_document_index("Python lists are mutable.")
+    assert select_context(index, "What are lists?", 500) == (index["text"], index["tokens"])
+
+
+def test_context_fits_budget_and_prefers_relevant_chunks():
+    index = _document_index()
+    context, tokens = select_context(index, "What do decorators do?", 600)
+    assert 0 < tokens <= 600
+    assert "Decorators wrap functions" in context
+
+
+def test_over_budget_question_still_gets_best_chunk():
+    index = _document_index()
+    traceback = "Traceback (most recent call last): decorators " + "File x.py, line 1, in f\n" * 400
+    budget = context_token_budget(traceback, 200, 500)
+    assert budget == 0
+
+    context, tokens = select_context(index, traceback, budget)
+    assert context
+    assert "Decorators wrap functions" in context
+    assert tokens > 0
@@ -6,27 +6,6 @@ import { useReactMediaRecorder } from 'react-media-recorder';
 import helloGif from '../assets/Hello.webp';
 import voiceSound from '../assets/Voice.mp3';
 
-// Helper to decode Base64 audio
-const b64toBlob = (b64Data, contentType = 'audio/wav', sliceSize = 512) => {
-  try {
-    const byteCharacters = atob(b64Data);
-    const byteArrays = [];
-    for (let offset = 0; offset < byteCharacters.length; offset += sliceSize) {
-      const slice = byteCharacters.slice(offset, offset + sliceSize);
-      const byteNumbers = new Array(slice.length);
-      for (let i = 0; i < slice.length; i++) {
-        byteNumbers[i] = slice.charCodeAt(i);
-      }
-      const byteArray = new Uint8Array(byteNumbers);
-      byteArrays.push(byteArray);
-    }
-    return new Blob(byteArrays, { type: contentType });
-  } catch (error) {
-    console.error('Error decoding base64 audio:', error);
-    return null;
-  }
-};
-
 export const VoiceAgentOverlay = ({ onClose }) => {
   const [statusText, setStatusText] = useState('Press to speak');
   const [transcript, setTranscript] = useState('');
@@ -59,7 +38,8 @@ export const VoiceAgentOverlay = ({ onClose }) => {
 
     try {
       console.log('📤 Sending audio to backend...');
-      const response = await fetch('/api/voice', {
+      // Binary mode: WAV body, transcript and reply text in headers
+      const response = await fetch('/api/voice?response_mode=binary', {
         method: 'POST',
         body: formData,
       });
@@ -68,29 +48,27 @@ export const VoiceAgentOverlay = ({ onClose }) => {
         throw new Error(`Server error: ${response.status} ${response.statusText}`);
       }
 
-      const data = await response.json();
-      console.log('📥 Response received:', data);
-
-      if (data.error) {
-        throw new Error(data.error);
+      // Errors still come back as JSON
+      const contentType = response.headers.get('Content-Type') || '';
+      if (contentType.includes('application/json')) {
+        const data = await response.json();
+        throw new Error(data.error || 'Incomplete response from server');
       }
 
-      if (!data.transcript || !data.text_response || !data.audio_response_b64) {
+      const transcriptHeader = response.headers.get('X-Transcript');
+      const textHeader = response.headers.get('X-Text-Response');
+      if (!transcriptHeader || !textHeader) {
         throw new Error('Incomplete response from server');
       }
 
-      setTranscript(data.transcript);
-      setBotResponse(data.text_response);
+      const audioBlob = await response.blob();
+      console.log('📥 Response received:', audioBlob.size, 'bytes');
+
+      setTranscript(decodeURIComponent(transcriptHeader));
+      setBotResponse(decodeURIComponent(textHeader));
       setStatusText('Speaking...');
       setIsProcessing(false);
 
-      console.log('🔊 Decoding audio response...');
-      const audioBlob = b64toBlob(data.audio_response_b64, 'audio/wav');
-      
-      if (!audioBlob) {
-        throw new Error('Failed to decode audio');
-      }
-
       const audioUrl = URL.createObjectURL(audioBlob);
 
       if (audioRef.current) {